@@ -0,0 +1,88 @@
+import hashlib
+import os
+import sqlite3
+import time
+from contextlib import closing
+
+# --- Configuration ---
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".deck-gen-cache.sqlite3")
+DEFAULT_TTL = 7 * 24 * 60 * 60  # 7 days, in seconds
+
+
+class SQLiteCache:
+    """A small on-disk key/value store backed by SQLite, with per-entry expiry."""
+
+    def __init__(self, table, ttl=DEFAULT_TTL, path=CACHE_PATH):
+        self.table = table
+        self.ttl = ttl
+        self.path = path
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {self.table} "
+                    "(key TEXT PRIMARY KEY, value TEXT, created_at REAL)"
+                )
+        except sqlite3.Error as e:
+            print(f"  -> Cache unavailable ({self.table}): {e}")
+
+    def _connect(self):
+        # A fresh connection per call keeps the cache safe to use from worker threads
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, key):
+        """Returns the cached value for key, or None if missing or expired."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    f"SELECT value, created_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error:
+            return None
+        if row is None:
+            return None
+        value, created_at = row
+        if self.ttl is not None and time.time() - created_at > self.ttl:
+            return None
+        return value
+
+    def set(self, key, value):
+        """Stores value under key, replacing any previous entry."""
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, value, created_at) VALUES (?, ?, ?)",
+                    (key, value, time.time()),
+                )
+        except sqlite3.Error:
+            pass
+
+
+_gemini_cache = None
+
+
+def generate_content_cached(model, prompt, parse):
+    """Returns parse() of the text Gemini generates for prompt, served from the disk cache when possible.
+
+    A response is only cached once parse accepts it, so a malformed reply is retried on the next run.
+    """
+    global _gemini_cache
+    if _gemini_cache is None:
+        _gemini_cache = SQLiteCache("gemini_responses")
+
+    key = hashlib.sha256((model.model_name + prompt).encode("utf-8")).hexdigest()
+    cached_text = _gemini_cache.get(key)
+    if cached_text:
+        try:
+            result = parse(cached_text)
+        except Exception:
+            # Entries that no longer parse are ignored and overwritten below
+            pass
+        else:
+            print("  -> Using cached AI response.")
+            return result
+
+    response_text = model.generate_content(prompt).text
+    result = parse(response_text)
+    if response_text:
+        _gemini_cache.set(key, response_text)
+    return result
@@ -1,15 +1,21 @@
-import google.generativeai as genai
+# Heavy modules (google.generativeai, pptx, PIL) are imported where they're first used,
+# so the topic prompt appears without waiting for them to load.
+import httpx
 import requests
-from bs4 import BeautifulSoup
-from pptx import Presentation
-from pptx.util import Inches, Pt
-from pptx.enum.text import MSO_AUTO_SIZE
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import asyncio
+import orjson
 import io
+import math
+import multiprocessing
+import re
 import urllib.parse
-from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
 from dotenv import load_dotenv
 import os
+import hashlib
+from _llm_cache import SQLiteCache, generate_content_cached
 
 # --- Load Environment Variables ---
 load_dotenv()
@@ -19,42 +25,162 @@ load_dotenv()
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 GOOGLE_SEARCH_API_KEY = os.getenv("GOOGLE_SEARCH_API_KEY")
 CUSTOM_SEARCH_ENGINE_ID = os.getenv("CUSTOM_SEARCH_ENGINE_ID")
+SEARCH_CACHE_TTL = 60 * 60  # Web search results are reused for an hour
 
-if "YOUR_GEMINI_API_KEY" in GOOGLE_API_KEY:
-    print("ERROR: Please set your GOOGLE_API_KEY in the script.")
+# Google Custom Search is optional; decide once whether usable keys were provided
+GOOGLE_SEARCH_ENABLED = (
+    bool(GOOGLE_SEARCH_API_KEY) and "YOUR_" not in GOOGLE_SEARCH_API_KEY
+    and bool(CUSTOM_SEARCH_ENGINE_ID) and "YOUR_" not in CUSTOM_SEARCH_ENGINE_ID
+)
+
+# --- Shared HTTP Session ---
+# Reusing one session keeps connections alive, avoiding a TCP+TLS handshake per request
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.3))
+SESSION.mount('https://', _adapter)
+SESSION.mount('http://', _adapter)
+SESSION.headers.update({'User-Agent': 'Mozilla/5.0'})
+
+# Formats Pillow is asked to recognise, and the subset python-pptx can embed as-is
+IMAGE_FORMATS = ['JPEG', 'PNG', 'GIF', 'BMP', 'WEBP', 'TIFF']
+PPTX_NATIVE_FORMATS = ('PNG', 'JPEG', 'GIF', 'BMP')
+MAX_IMAGE_BYTES = 4_000_000  # Larger downloads are skipped rather than embedded
+# Image conversion workers must not be forked from this multithreaded process;
+# forkserver isn't available on Windows, where spawn is the default anyway
+PROCESS_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+# Image queries whose embeddings are more similar than this share one image
+EMBEDDING_MODEL = 'models/text-embedding-004'
+SEMANTIC_MATCH_THRESHOLD = 0.92
+
+# Slide text formatting, in points
+BULLET_SPACE_AFTER = 8
+SUMMARY_FONT_SIZE = 15  # Overview and conclusion slides
+KEY_POINT_FONT_SIZE = 18
+
+# Strips Markdown code fences (```json ... ```) that Gemini sometimes wraps around JSON
+_FENCE_RE = re.compile(r'^\u200b?```(?:json)?[ \t]*\n?|\n?[ \t]*```[ \t]*$', re.MULTILINE | re.IGNORECASE)
+
+# Characters XML can't hold; escaped as _xHHHH_ the way python-pptx does for run text
+_XML_ILLEGAL_CHARS_RE = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ud800-\udfff\ufffe\uffff]')
+
+if not GOOGLE_API_KEY or "YOUR_GEMINI_API_KEY" in GOOGLE_API_KEY:
+    print("ERROR: Please set your GOOGLE_API_KEY in the .env file.")
     exit()
 
-genai.configure(api_key=GOOGLE_API_KEY)
+_genai_configured = False
+
+
+def _parse_json_response(response_text):
+    """Parses a Gemini reply as JSON, after stripping any Markdown code fences around it."""
+    # Clean up the response to ensure it's valid JSON
+    return orjson.loads(_FENCE_RE.sub('', response_text).strip())
+
+
+def _configure_genai():
+    """Imports and configures the Gemini client the first time an agent needs it."""
+    global _genai_configured
+    if not _genai_configured:
+        import google.generativeai as genai
+        genai.configure(api_key=GOOGLE_API_KEY)
+        _genai_configured = True
+
+
+def _convert_to_png(image_bytes):
+    """Re-encodes image bytes as PNG. Module-level so it can be pickled into a worker process."""
+    from PIL import Image
+
+    image = Image.open(io.BytesIO(image_bytes), formats=IMAGE_FORMATS)
+    output_stream = io.BytesIO()
+    image.save(output_stream, format='PNG')
+    return output_stream.getvalue()
+
+
+def _cosine_similarity(a, b):
+    """Returns the cosine similarity of two equal-length vectors."""
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _add_bullets(tf, points, font_size):
+    """Appends one paragraph per point directly to the text frame's XML, replacing the empty default one."""
+    from pptx.oxml.ns import qn
+    from pptx.oxml.xmlchemy import OxmlElement
+
+    def add_child(parent, tag, **attributes):
+        child = OxmlElement(tag)
+        for name, value in attributes.items():
+            child.set(name, value)
+        parent.append(child)
+        return child
+
+    tx_body = tf._txBody
+    if points:
+        for empty_paragraph in tx_body.findall(qn('a:p')):
+            tx_body.remove(empty_paragraph)
+
+    # DrawingML stores spacing and font sizes in hundredths of a point
+    space_after = str(round(BULLET_SPACE_AFTER * 100))
+    size = str(round(font_size * 100))
+    for point in points:
+        paragraph = add_child(tx_body, 'a:p')
+        spacing = add_child(add_child(paragraph, 'a:pPr'), 'a:spcAft')
+        add_child(spacing, 'a:spcPts', val=space_after)
+        run = add_child(paragraph, 'a:r')
+        add_child(run, 'a:rPr', sz=size)
+        # Collapse newlines and tabs, which python-pptx would otherwise have turned into breaks
+        text = " ".join(str(point).split())
+        add_child(run, 'a:t').text = _XML_ILLEGAL_CHARS_RE.sub(lambda m: f"_x{ord(m.group()):04X}_", text)
+
 
 # --- Agent Definitions ---
 
 class ResearchAgent:
     """An agent that scours the web for information on a topic using multiple search engines."""
-    
+    def __init__(self):
+        self.cache = SQLiteCache("search_results", ttl=SEARCH_CACHE_TTL)
+
+    def _cached_search(self, engine, search_fn, topic):
+        """Returns a cached result for (engine, topic), running search_fn only on a miss."""
+        key = hashlib.md5((engine + topic).encode("utf-8")).hexdigest()
+        cached_context = self.cache.get(key)
+        if cached_context is not None:
+            print(f"  -> Using cached {engine} results.")
+            return cached_context
+        context = search_fn(topic)
+        # Only successful searches are cached so failures are retried next run
+        if context:
+            self.cache.set(key, context)
+        return context
+
     def _search_duckduckgo(self, topic):
-        """Performs a search on DuckDuckGo and returns context."""
+        """Queries DuckDuckGo's Instant Answer JSON API and returns context."""
         try:
             print("  -> Searching DuckDuckGo...")
-            search_url = f"https://html.duckduckgo.com/html/?q={urllib.parse.quote(topic)}"
-            headers = {'User-Agent': 'Mozilla/5.0'}
-            response = requests.get(search_url, headers=headers, timeout=10)
+            search_url = f"https://api.duckduckgo.com/?q={urllib.parse.quote(topic)}&format=json&no_html=1&skip_disambig=1"
+            response = SESSION.get(search_url, timeout=10)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, 'html.parser')
-            snippets = [p.get_text() for p in soup.find_all('a', class_='result__snippet')]
-            return " ".join(snippets[:3]) if snippets else ""
+            results = response.json()
+            snippets = [results.get('AbstractText'), results.get('Answer')]
+            # Grouped related topics have no 'Text' of their own and are skipped
+            related = [topic_item.get('Text') for topic_item in results.get('RelatedTopics', []) if topic_item.get('Text')]
+            snippets.extend(related[:3])
+            snippets = [snippet for snippet in snippets if isinstance(snippet, str) and snippet]
+            return " ".join(snippets) if snippets else ""
         except Exception as e:
             print(f"      -> DuckDuckGo search failed: {e}")
             return ""
 
     def _search_google(self, topic):
         """Performs a search using Google's Custom Search API."""
-        if "YOUR_GOOGLE_SEARCH_API_KEY" in GOOGLE_SEARCH_API_KEY or "YOUR_CSE_ID" in CUSTOM_SEARCH_ENGINE_ID:
+        if not GOOGLE_SEARCH_ENABLED:
             print("  -> Google Search keys not provided. Skipping Google search.")
             return ""
         try:
             print("  -> Searching Google...")
             api_url = f"https://www.googleapis.com/customsearch/v1?key={GOOGLE_SEARCH_API_KEY}&cx={CUSTOM_SEARCH_ENGINE_ID}&q={urllib.parse.quote(topic)}"
-            response = requests.get(api_url, timeout=10)
+            response = SESSION.get(api_url, timeout=10)
             response.raise_for_status()
             search_results = response.json()
             snippets = [item.get('snippet', '') for item in search_results.get('items', [])]
@@ -63,10 +189,13 @@ class ResearchAgent:
             print(f"      -> Google search failed: {e}")
             return ""
 
-    def search_web_for_topic(self, topic):
+    async def search_web_for_topic(self, topic):
         print(f"🕵️  ResearchAgent: Searching the web for '{topic}'...")
-        ddg_context = self._search_duckduckgo(topic)
-        google_context = self._search_google(topic)
+        # Run both engines concurrently so the wait is bounded by the slower one
+        ddg_context, google_context = await asyncio.gather(
+            asyncio.to_thread(self._cached_search, "DuckDuckGo", self._search_duckduckgo, topic),
+            asyncio.to_thread(self._cached_search, "Google", self._search_google, topic),
+        )
         
         combined_context = (ddg_context + " " + google_context).strip()
         
@@ -99,11 +228,16 @@ class OrchestratorAgent:
 
 class ContentStrategistAgent:
     """An agent that executes a plan to write the presentation content."""
+    def __init__(self):
+        _configure_genai()
+
     def generate_presentation_content(self, topic, web_context, plan):
+        import google.generativeai as genai
+
         print("✍️  ContentStrategistAgent: Executing plan and writing content...")
         model = genai.GenerativeModel('gemini-2.5-flash')
         
-        plan_str = json.dumps(plan)
+        plan_str = orjson.dumps(plan).decode()
         prompt = f"""
         Act as a Content Strategist. Your task is to generate the text content for a presentation about "{topic}".
         Use the provided web context: "{web_context}".
@@ -111,6 +245,8 @@ class ContentStrategistAgent:
 
         For each slide in the plan, generate a "title" and a list of "points".
         *** IMPORTANT: Generate only 4 or 5 bullet points per slide. Each point must be a short but explanatory sentence, not just a heading. ***
+        For each slide with a "type" of "key_point_slide", also include a simple, one or two-word "image_query".
+        This query should be perfect for finding a high-quality stock photo on a site like Pixabay or Google Images.
         
         Return a single, raw JSON object that contains a "slides" key, which is a list of slide objects with the content filled in.
         
@@ -119,60 +255,36 @@ class ContentStrategistAgent:
             "slides": [
                 {{"type": "title_slide", "title": "The Evolution of Artificial Intelligence", "points": []}},
                 {{"type": "overview_slide", "title": "Overview", "points": ["Exploring the foundational concepts of AI.", "Covering the major milestones and breakthroughs."]}},
-                {{"type": "key_point_slide", "title": "Early Concepts and the Turing Test", "points": ["Alan Turing's 1950 paper proposed a test for machine intelligence, now known as the Turing Test.", "Early research focused on problem-solving and symbolic methods."]}},
+                {{"type": "key_point_slide", "title": "Early Concepts and the Turing Test", "points": ["Alan Turing's 1950 paper proposed a test for machine intelligence, now known as the Turing Test.", "Early research focused on problem-solving and symbolic methods."], "image_query": "Alan Turing"}},
                 {{"type": "conclusion_slide", "title": "Conclusion", "points": ["AI has evolved from simple concepts to complex neural networks.", "The future of AI holds immense potential for innovation across all industries."]}}
             ]
         }}
         """
         try:
-            response = model.generate_content(prompt)
-            # Clean up the response to ensure it's valid JSON
-            content_json = response.text.strip().replace("```json", "").replace("```", "")
+            content = generate_content_cached(model, prompt, _parse_json_response)
             print("  -> AI content structure generated successfully.")
-            return json.loads(content_json)
+            return content
         except Exception as e:
             print(f"  -> AI content generation failed: {e}")
             return None
 
-class VisualAssetAgent:
-    """An agent that determines the best visual assets for the content."""
-    def add_image_queries_to_content(self, content):
-        print("🎨 VisualAssetAgent: Determining image queries...")
-        model = genai.GenerativeModel('gemini-2.5-flash')
-        
-        content_str = json.dumps(content)
-        prompt = f"""
-        Act as a Visual Asset Director. For each slide with a "type" of "key_point_slide" in the following JSON object, add a simple, one or two-word "image_query".
-        This query should be perfect for finding a high-quality stock photo on a site like Pixabay or Google Images.
-        Return the entire JSON object, now including the "image_query" fields where appropriate.
-        
-        JSON Input:
-        {content_str}
-        
-        Return nothing but the updated, raw JSON object.
-        """
-        try:
-            response = model.generate_content(prompt)
-            enriched_content_json = response.text.strip().replace("```json", "").replace("```", "")
-            print("  -> Image queries added successfully.")
-            return json.loads(enriched_content_json)
-        except Exception as e:
-            print(f"  -> Failed to add image queries: {e}")
-            # Return original content if the AI fails
-            return content
-
 class PowerPointAssemblyAgent:
     """An agent that assembles the final PowerPoint presentation."""
-    def _get_image_for_slide(self, query):
-        """Searches for an image and converts it to a supported format (PNG)."""
-        if "YOUR_GOOGLE_SEARCH_API_KEY" in GOOGLE_SEARCH_API_KEY or "YOUR_CSE_ID" in CUSTOM_SEARCH_ENGINE_ID:
+    def __init__(self):
+        # Images fetched so far keyed by normalized query, and the embeddings of those queries
+        self.image_cache = {}
+        self.image_embeddings = {}
+
+    async def _get_image_for_slide(self, client, process_pool, query):
+        """Searches for an image and downloads it in a format PowerPoint can embed."""
+        if not GOOGLE_SEARCH_ENABLED:
             print("  -> Google Search keys not provided. Skipping image insertion.")
             return None
             
         print(f"🖼️  AssemblyAgent: Searching Google Images for '{query}'...")
         try:
             api_url = f"https://www.googleapis.com/customsearch/v1?key={GOOGLE_SEARCH_API_KEY}&cx={CUSTOM_SEARCH_ENGINE_ID}&q={urllib.parse.quote(query)}&searchType=image&num=1"
-            response = requests.get(api_url, timeout=10)
+            response = await client.get(api_url)
             response.raise_for_status()
             search_results = response.json()
             
@@ -182,30 +294,173 @@ class PowerPointAssemblyAgent:
 
             image_url = search_results['items'][0]['link']
             
-            image_response = requests.get(image_url, timeout=10)
-            image_response.raise_for_status()
-            
-            print("  -> Google image downloaded successfully. Converting to PNG...")
+            # Stream the download so oversized images are rejected without buffering them fully
+            async with client.stream("GET", image_url) as image_response:
+                image_response.raise_for_status()
+                if int(image_response.headers.get('Content-Length', 0)) > MAX_IMAGE_BYTES:
+                    print("  -> Image is too large. Skipping image insertion.")
+                    return None
 
-            # Open the downloaded image data with Pillow
-            image = Image.open(io.BytesIO(image_response.content))
-            
-            # Create a new in-memory byte stream to hold the converted image
-            output_stream = io.BytesIO()
-            
-            # Save the image to the stream in PNG format
-            image.save(output_stream, format='PNG')
-            output_stream.seek(0) # Rewind the stream to the beginning
+                image_data = bytearray()
+                async for chunk in image_response.aiter_bytes():
+                    image_data += chunk
+                    # Content-Length can be missing or wrong, so enforce the cap while reading too
+                    if len(image_data) > MAX_IMAGE_BYTES:
+                        print("  -> Image is too large. Skipping image insertion.")
+                        return None
             
+            print("  -> Google image downloaded successfully.")
+
+            from PIL import Image
+
+            # Opening only reads the header, so sniffing the format here is cheap
+            image_bytes = bytes(image_data)
+            image = Image.open(io.BytesIO(image_bytes), formats=IMAGE_FORMATS)
+
+            # Formats PowerPoint understands are embedded as downloaded, skipping the re-encode
+            if image.format in PPTX_NATIVE_FORMATS:
+                return io.BytesIO(image_bytes)
+
+            print(f"  -> Converting {image.format} image to PNG...")
+            # PNG encoding is CPU-bound and holds the GIL, so it runs in a separate process
+            loop = asyncio.get_running_loop()
+            png_bytes = await loop.run_in_executor(process_pool, _convert_to_png, image_bytes)
             print("  -> Image converted successfully.")
-            return output_stream
+            return io.BytesIO(png_bytes)
 
         except Exception as e:
             print(f"  -> Google Image search/download/conversion failed: {e}")
             return None
 
+    def _image_query(self, slide_data, topic):
+        """Returns the slide's image query, falling back to the topic if it's missing or not usable text."""
+        query = slide_data.get("image_query")
+        return query if isinstance(query, str) and query.strip() else topic
+
+    def _embed_queries(self, queries):
+        """Returns an embedding vector per query, or None if the embedding call fails."""
+        try:
+            _configure_genai()
+            import google.generativeai as genai
+
+            result = genai.embed_content(model=EMBEDDING_MODEL, content=queries)
+            return result['embedding']
+        except Exception as e:
+            print(f"  -> Query embedding failed, matching image queries exactly: {e}")
+            return None
+
+    def _match_similar_queries(self, queries):
+        """Maps each query that means the same as a cached or earlier query onto that query."""
+        # Embeddings are only needed for new queries, and only once there is something to compare against
+        if not GOOGLE_SEARCH_ENABLED or not queries or len(queries) + len(self.image_embeddings) < 2:
+            return {}, {}
+        embeddings = self._embed_queries(queries)
+        if not embeddings:
+            return {}, {}
+
+        new_embeddings = dict(zip(queries, embeddings))
+        candidates = dict(self.image_embeddings)
+        aliases = {}
+        for query, embedding in new_embeddings.items():
+            best_match, best_score = None, 0.0
+            for other_query, other_embedding in candidates.items():
+                score = _cosine_similarity(embedding, other_embedding)
+                if score > best_score:
+                    best_match, best_score = other_query, score
+
+            if best_score > SEMANTIC_MATCH_THRESHOLD:
+                print(f"  -> Reusing the image for '{best_match}' for similar query '{query}'.")
+                aliases[query] = best_match
+            else:
+                candidates[query] = embedding
+        return aliases, new_embeddings
+
+    async def _fetch_images(self, queries, max_concurrency):
+        """Runs the image search/download for each query concurrently, returning streams in order."""
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        # HTTP/2 lets concurrent googleapis.com requests share a single connection
+        async with httpx.AsyncClient(
+            http2=True,
+            timeout=10.0,
+            follow_redirects=True,
+            headers={'User-Agent': 'Mozilla/5.0'},
+            limits=httpx.Limits(max_connections=16),
+        ) as client:
+            # There are never more workers than there are images to convert
+            with ProcessPoolExecutor(
+                max_workers=min(len(queries), os.cpu_count() or 1),
+                mp_context=multiprocessing.get_context(PROCESS_START_METHOD),
+            ) as process_pool:
+                async def fetch(query):
+                    async with semaphore:
+                        return await self._get_image_for_slide(client, process_pool, query)
+
+                return await asyncio.gather(*(fetch(query) for query in queries))
+
+    async def _get_images_bulk(self, queries, max_concurrency=5):
+        """Fetches images for all queries concurrently, returning a dict of query -> stream.
+
+        Queries that match an earlier one exactly (ignoring case) or semantically reuse its image.
+        """
+        normalized = {query: query.strip().lower() for query in queries}
+        new_queries = [query for query in dict.fromkeys(normalized.values()) if query not in self.image_cache]
+        aliases, new_embeddings = await asyncio.to_thread(self._match_similar_queries, new_queries)
+        queries_to_fetch = [query for query in new_queries if query not in aliases]
+
+        # Only queries with no exact or semantic match need a network round trip
+        streams = await self._fetch_images(queries_to_fetch, max_concurrency) if queries_to_fetch else []
+
+        fetched = dict(zip(queries_to_fetch, streams))
+        # A query matched to one whose fetch failed falls back to its own search
+        orphaned_queries = [query for query, source_query in aliases.items() if source_query in fetched and fetched[source_query] is None]
+        if orphaned_queries:
+            fetched.update(zip(orphaned_queries, await self._fetch_images(orphaned_queries, max_concurrency)))
+            for query in orphaned_queries:
+                del aliases[query]
+
+        for query, stream in fetched.items():
+            # Failed lookups aren't cached so a later deck can try them again
+            if stream is not None:
+                self.image_cache[query] = stream
+                if query in new_embeddings:
+                    self.image_embeddings[query] = new_embeddings[query]
+
+        image_streams = {}
+        for query, normalized_query in normalized.items():
+            source_query = aliases.get(normalized_query, normalized_query)
+            stream = fetched.get(source_query) or self.image_cache.get(source_query)
+            if stream is not None:
+                stream.seek(0)
+            image_streams[query] = stream
+        return image_streams
+
+    async def prefetch_images(self, content, topic):
+        """Fetches every key point slide's image up front, returning a dict of query -> stream."""
+        slides = content.get('slides') if isinstance(content, dict) else None
+        if not isinstance(slides, list):
+            return {}
+
+        image_queries = [
+            self._image_query(slide_data, topic)
+            for slide_data in slides
+            if slide_data.get('type') == 'key_point_slide'
+        ]
+        if not image_queries:
+            return {}
+        if not GOOGLE_SEARCH_ENABLED:
+            print("  -> Google Search keys not provided. Skipping image insertion.")
+            return {}
+        return await self._get_images_bulk(image_queries)
+
+    def create_powerpoint_deck(self, content, topic, output_path=None, image_streams=None):
+        """Builds the deck, saving it to output_path if given, otherwise returning an in-memory stream.
+
+        image_streams maps image queries to prefetched images; if omitted they are fetched here.
+        """
+        from pptx import Presentation
+        from pptx.enum.text import MSO_AUTO_SIZE
 
-    def create_powerpoint_deck(self, content, topic):
         print("🛠️  PowerPointAssemblyAgent: Building the presentation...")
         prs = Presentation()
         
@@ -213,52 +468,50 @@ class PowerPointAssemblyAgent:
             print("  -> ERROR: Content is not in the expected format with a 'slides' list.")
             return None
 
+        # Callers without an event loop of their own get the images fetched here
+        if image_streams is None:
+            image_streams = asyncio.run(self.prefetch_images(content, topic))
+
+        # Look the layouts up once rather than for every slide
+        title_layout = prs.slide_layouts[0]
+        content_layout = prs.slide_layouts[1] # Title and Content
+        two_content_layout = prs.slide_layouts[3] # Two Content
+
         for slide_data in content['slides']:
             slide_type = slide_data.get('type')
             title = slide_data.get('title', 'Untitled Slide')
             points = slide_data.get('points', [])
 
             if slide_type == 'title_slide':
-                slide = prs.slides.add_slide(prs.slide_layouts[0])
+                slide = prs.slides.add_slide(title_layout)
                 slide.shapes.title.text = title
                 slide.placeholders[1].text = f"A Presentation on {topic}"
             
             elif slide_type in ['overview_slide', 'conclusion_slide']:
-                slide = prs.slides.add_slide(prs.slide_layouts[1]) # Title and Content
+                slide = prs.slides.add_slide(content_layout)
                 slide.shapes.title.text = title
                 tf = slide.shapes.placeholders[1].text_frame
                 tf.clear()
                 tf.word_wrap = True
                 tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
                 
-                for point in points:
-                    p = tf.add_paragraph()
-                    p.text = point
-                    p.level = 0
-                    p.space_after = Pt(8) 
-                    p.font.size = Pt(15)
+                _add_bullets(tf, points, SUMMARY_FONT_SIZE)
 
             elif slide_type == 'key_point_slide':
-                image_query = slide_data.get("image_query", topic)
-                image_stream = self._get_image_for_slide(image_query)
+                image_query = self._image_query(slide_data, topic)
+                image_stream = image_streams.get(image_query)
 
                 # If an image is found, use the two-content layout.
                 if image_stream:
-                    slide = prs.slides.add_slide(prs.slide_layouts[3]) # Two Content
+                    slide = prs.slides.add_slide(two_content_layout)
                     slide.shapes.title.text = title
                     
                     # Add text content to the left placeholder
-                    left_placeholder = slide.placeholders[1]
-                    tf = left_placeholder.text_frame
+                    tf = slide.placeholders[1].text_frame
                     tf.clear()
                     tf.word_wrap = True
                     tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
-                    for point in points:
-                        p = tf.add_paragraph()
-                        p.text = point
-                        p.level = 0
-                        p.space_after = Pt(8)
-                        p.font.size = Pt(18)
+                    _add_bullets(tf, points, KEY_POINT_FONT_SIZE)
                     
                     # Add image to the right placeholder
                     right_placeholder = slide.placeholders[2]
@@ -271,20 +524,21 @@ class PowerPointAssemblyAgent:
                     )
                 # If no image is found, use the standard Title and Content layout.
                 else:
-                    slide = prs.slides.add_slide(prs.slide_layouts[1]) # Title and Content
+                    slide = prs.slides.add_slide(content_layout)
                     slide.shapes.title.text = title
                     tf = slide.shapes.placeholders[1].text_frame
                     tf.clear()
                     tf.word_wrap = True
                     tf.auto_size = MSO_AUTO_SIZE.TEXT_TO_FIT_SHAPE
                     
-                    for point in points:
-                        p = tf.add_paragraph()
-                        p.text = point
-                        p.level = 0
-                        p.space_after = Pt(8) 
-                        p.font.size = Pt(18)
+                    _add_bullets(tf, points, KEY_POINT_FONT_SIZE)
             
+        # Writing straight to disk avoids holding a second copy of the deck in memory
+        if output_path:
+            prs.save(output_path)
+            print("  -> Presentation assembled successfully.")
+            return output_path
+
         file_stream = io.BytesIO()
         prs.save(file_stream)
         file_stream.seek(0)
@@ -293,48 +547,60 @@ class PowerPointAssemblyAgent:
 
 
 # --- Main Execution Block ---
-if __name__ == '__main__':
-    # ---GET THE PRESENTATION TOPIC FROM THE USER ---
-    presentation_topic = input("Please enter the topic for your presentation: ")
-
-    print(f"\n--- Starting Presentation Generation for: '{presentation_topic}' ---")
-
-    # ---ORCHESTRATE THE AGENTIC WORKFLOW ---
+async def pipeline(presentation_topic):
+    """Runs the agentic workflow for one topic and saves the resulting presentation."""
     researcher = ResearchAgent()
     orchestrator = OrchestratorAgent()
-    content_strategist = ContentStrategistAgent()
-    visual_director = VisualAssetAgent()
     assembler = PowerPointAssemblyAgent()
 
-    # Research the topic
-    web_context = researcher.search_web_for_topic(presentation_topic)
-    
-    # Create a plan
-    presentation_plan = orchestrator.create_presentation_plan(presentation_topic, web_context)
+    # Start researching the topic in the background
+    research_task = asyncio.create_task(researcher.search_web_for_topic(presentation_topic))
+
+    # The fixed plan doesn't depend on the research, so it's built while the web searches are in flight
+    presentation_plan = orchestrator.create_presentation_plan(presentation_topic, None)
     if not presentation_plan:
+        research_task.cancel()
         print("ERROR: Failed to create presentation plan. Exiting.")
-        exit()
+        return
+    # Loading the Gemini client is slow, so it also happens in a worker thread during the searches
+    content_strategist = await asyncio.to_thread(ContentStrategistAgent)
 
-    # Generate the initial text content
-    initial_content = content_strategist.generate_presentation_content(presentation_topic, web_context, presentation_plan)
-    if not initial_content:
-        print("ERROR: Failed to generate initial content. Exiting.")
-        exit()
-        
-    # Add image search queries to the content
-    enriched_content = visual_director.add_image_queries_to_content(initial_content)
-    
-    # Build the PowerPoint file
-    ppt_stream = assembler.create_powerpoint_deck(enriched_content, presentation_topic)
+    web_context = await research_task
+
+    # Generate the text content along with the image search queries
+    content = await asyncio.to_thread(
+        content_strategist.generate_presentation_content, presentation_topic, web_context, presentation_plan
+    )
+    if not content:
+        print("ERROR: Failed to generate content. Exiting.")
+        return
     
-    # ---SAVE THE FINAL PRESENTATION ---
-    if ppt_stream:
-        output_filename = f"presentation-{presentation_topic}.pptx"
-        try:
-            with open(output_filename, 'wb') as f:
-                f.write(ppt_stream.getbuffer())
-            print(f"\nWorkflow Complete. Presentation saved as '{output_filename}'")
-        except Exception as e:
-            print(f"\nERROR: Failed to save the presentation file: {e}")
+    # Fetch the slide images, then build the PowerPoint file and save it straight to disk.
+    # Only the blocking python-pptx work goes to a worker thread.
+    output_filename = f"presentation-{presentation_topic}.pptx"
+    try:
+        image_streams = await assembler.prefetch_images(content, presentation_topic)
+        saved_path = await asyncio.to_thread(
+            assembler.create_powerpoint_deck,
+            content,
+            presentation_topic,
+            output_path=output_filename,
+            image_streams=image_streams,
+        )
+    except Exception as e:
+        print(f"\nERROR: Failed to build or save the presentation file: {e}")
     else:
-        print("\nERROR: Failed to assemble the PowerPoint file. No file was saved.")
\ No newline at end of file
+        if saved_path:
+            print(f"\nWorkflow Complete. Presentation saved as '{saved_path}'")
+        else:
+            print("\nERROR: Failed to assemble the PowerPoint file. No file was saved.")
+
+
+if __name__ == '__main__':
+    # ---GET THE PRESENTATION TOPIC FROM THE USER ---
+    presentation_topic = input("Please enter the topic for your presentation: ")
+
+    print(f"\n--- Starting Presentation Generation for: '{presentation_topic}' ---")
+
+    # ---ORCHESTRATE THE AGENTIC WORKFLOW ---
+    asyncio.run(pipeline(presentation_topic))